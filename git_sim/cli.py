@@ -1,81 +1,136 @@
 """
 Interfaz de línea de comandos para el sistema de simulación Git.
 """
-from typing import Dict, Optional
+import shlex
+import sys
+from functools import partial
+from typing import Callable, Dict, Final, FrozenSet, Optional, Tuple
 from .repository_manager import RepositoryManager
-from .commands import (
-    Command, InitCommand, AddCommand, CommitCommand,
-    CheckoutCommand, StatusCommand, LogCommand,
-    PRCreateCommand, PRStatusCommand, PRReviewCommand,
-    PRApproveCommand, PRRejectCommand, PRCancelCommand,
-    PRListCommand, PRNextCommand, PRTagCommand, PRClearCommand,
-    BranchCommand
-)
+from .commands import ALL_HELP, ArgSpec, ERR_NO_REPO, HANDLERS, HELP_SECTIONS
 from .config import Config
 
+# Error fijo del despacho de subcomandos de PR
+_ERR_PR_SUBCOMMAND_REQUIRED: Final = "Error: Se requiere subcomando para PR"
+
+class _LazyDispatch(dict):
+    """Tabla clave -> (manejador(repo, args), ArgSpec, requiere repositorio).
+    
+    Las entradas se construyen bajo demanda a partir de HANDLERS, de modo que
+    una sesión sólo paga por los comandos que realmente ejecuta.
+    """
+    def __init__(self, handlers: Dict[str, tuple], repo_manager: RepositoryManager):
+        super().__init__()
+        self._handlers = handlers
+        self._repo_manager = repo_manager
+    
+    def __missing__(self, key: str) -> Tuple[Callable[..., str], ArgSpec, bool]:
+        fn, _, spec, needs_repo = self._handlers[key]
+        entry = self[key] = (partial(fn, self._repo_manager), spec, needs_repo)
+        return entry
+
 class GitSimCLI:
     def __init__(self):
         # Configuración del sistema y gestor de repositorios
         self.config = Config()
         self.repo_manager = RepositoryManager()
         
-        # Diccionario de comandos disponibles
-        self.commands: Dict[str, Command] = {
-            'init': InitCommand(self.repo_manager),
-            'add': AddCommand(self.repo_manager),
-            'commit': CommitCommand(self.repo_manager),
-            'branch': BranchCommand(self.repo_manager),
-            'checkout': CheckoutCommand(self.repo_manager),
-            'status': StatusCommand(self.repo_manager),
-            'log': LogCommand(self.repo_manager),
-            'pr': {
-                'create': PRCreateCommand(self.repo_manager),  # Crear PR
-                'status': PRStatusCommand(self.repo_manager),  # Ver estado de PR
-                'review': PRReviewCommand(self.repo_manager),  # Añadir revisor a PR
-                'approve': PRApproveCommand(self.repo_manager),  # Aprobar PR
-                'reject': PRRejectCommand(self.repo_manager),  # Rechazar PR
-                'cancel': PRCancelCommand(self.repo_manager),  # Cancelar PR
-                'list': PRListCommand(self.repo_manager),  # Listar PRs
-                'next': PRNextCommand(self.repo_manager),  # Ver siguiente PR en cola
-                'tag': PRTagCommand(self.repo_manager),  # Añadir etiqueta a PR
-                'clear': PRClearCommand(self.repo_manager)  # Limpiar todos los PRs
-            }
-        }
+        # Tabla de despacho; cada manejador se enlaza al gestor la primera vez que se usa
+        self._dispatch = _LazyDispatch(HANDLERS, self.repo_manager)
+        
+        # Ayuda ya renderizada y versión de la configuración con la que se generó
+        self._help_cache: Optional[str] = None
+        self._help_version = -1
+        
+        # Instantánea de los comandos habilitados
+        self._enabled: FrozenSet[str] = frozenset()
+        self.refresh_config()
+    
+    def refresh_config(self) -> None:
+        """Sincroniza los comandos habilitados tras modificar self.config."""
+        self._enabled = frozenset(
+            name for name, _ in HELP_SECTIONS if self.config.is_command_enabled(name)
+        )
+        self._help_cache = None
+        self._help_version = self.config.version
     
     def execute(self, command: str, *args: str) -> str:
         """Ejecuta un comando git y devuelve el resultado como cadena."""
-        # Verifica si el comando existe
-        if command not in self.commands:
+        # Resincroniza los comandos habilitados si la configuración cambió
+        if self._help_version != self.config.version:
+            self.refresh_config()
+        
+        # Las claves con espacio ('pr create') sólo se forman a partir de 'pr' + subcomando
+        if ' ' in command:
+            return f"Error: Comando desconocido '{command}'"
+
+        # Resuelve la clave de la tabla (el subcomando de PR viene en args[0])
+        key, rest = sys.intern(command), args
+        if key == 'pr' and args:
+            key, rest = sys.intern('pr ' + args[0]), args[1:]
+        
+        try:
+            entry = self._dispatch[key]
+        except KeyError:
+            entry = None
+        if entry is None and command != 'pr':
             return f"Error: Comando desconocido '{command}'"
         
         # Verifica si el comando está habilitado en la configuración
-        if not self.config.is_command_enabled(command):
+        if command not in self._enabled:
             return f"Error: Comando '{command}' está deshabilitado"
         
-        # Manejo especial para subcomandos de PR
-        if command == 'pr':
+        # Subcomando de PR ausente o desconocido
+        if entry is None:
             if not args:
-                return "Error: Se requiere subcomando para PR"
-            subcommand = args[0]
-            if subcommand not in self.commands['pr']:
-                return f"Error: Subcomando de PR desconocido '{subcommand}'"
-            return self.commands['pr'][subcommand].execute(*args[1:])
+                return _ERR_PR_SUBCOMMAND_REQUIRED
+            return f"Error: Subcomando de PR desconocido '{args[0]}'"
+        
+        fn, spec, needs_repo = entry
+        err_msg = spec.check(rest)
+        if err_msg is not None:
+            return err_msg
+        
+        # Resuelve el repositorio actual una sola vez para todos los comandos
+        repo = self.repo_manager.current_repository
+        if needs_repo and repo is None:
+            return ERR_NO_REPO
         
-        # Ejecuta el comando normal
         try:
-            return self.commands[command].execute(*args)
+            return fn(repo, rest)
         except Exception as e:
             return f"Error: {str(e)}"
     
+    def dispatch(self, line: str) -> str:
+        """Divide una línea de entrada (sin el prefijo 'git') y la ejecuta."""
+        # Las comillas agrupan palabras, pero la barra invertida no escapa nada
+        # (rutas de Windows como C:\dir\f.txt llegan intactas)
+        lexer = shlex.shlex(line, posix=True)
+        lexer.whitespace_split = True
+        lexer.escape = ''
+        try:
+            parts = list(lexer)
+        except ValueError:
+            # Comilla sin cerrar (p. ej. un apóstrofo: commit -m don't): se divide
+            # por espacios, sin interpretar comillas
+            parts = line.split()
+        if not parts:
+            return ""
+        return self.execute(*parts)
+    
     def get_help(self) -> str:
         """Get help information for all enabled commands."""
+        if self._help_version != self.config.version:
+            self.refresh_config()
+        if self._help_cache is not None:
+            return self._help_cache
+        
+        if len(self._enabled) == len(HELP_SECTIONS):
+            self._help_cache = ALL_HELP
+            return ALL_HELP
+        
         help_text = ["Available commands:"]
-        for name, cmd in self.commands.items():
-            if self.config.is_command_enabled(name):
-                if isinstance(cmd, dict):  # Manejo de subcomandos de PR
-                    help_text.append(f"\n{name} subcomandos:")
-                    for subname, subcmd in cmd.items():
-                        help_text.append(f"  {subcmd.get_help()}")
-                else:
-                    help_text.append(cmd.get_help())
-        return "\n".join(help_text)
\ No newline at end of file
+        for name, text in HELP_SECTIONS:
+            if name in self._enabled:
+                help_text.append(text)
+        self._help_cache = "\n".join(help_text)
+        return self._help_cache
@@ -1,455 +1,317 @@
 """
-Implementación del patrón Command para operaciones Git.
+Tabla de manejadores para las operaciones Git.
+
+Cada comando es una función simple ``(repo_manager, repo, args) -> str``
+registrada en ``HANDLERS`` junto a su texto de ayuda, el número de
+argumentos que acepta (``ArgSpec``) y si necesita un repositorio
+seleccionado. El CLI resuelve el repositorio actual una sola vez y lo pasa
+ya validado al manejador.
 """
-from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
-from datetime import datetime
+import sys
+from typing import Callable, Dict, Final, Optional, Protocol, Tuple
+from .data_structures import PR_STATUS_LABELS
+from .repository import Repository
 from .repository_manager import RepositoryManager
 
-# Clase abstracta base para todos los comandos
-class Command(ABC):
-    @abstractmethod
-    def execute(self, *args) -> str:
-        """Método abstracto para ejecutar el comando."""
-        pass
-    
-    @abstractmethod
-    def get_help(self) -> str:
-        """Método abstracto para obtener texto de ayuda."""
-        pass
+# Error común cuando no hay repositorio seleccionado (validado por el CLI antes del despacho)
+ERR_NO_REPO: Final = "Error: No hay repositorio seleccionado"
+# Errores fijos que devuelven los propios manejadores
+_ERR_COMMIT_FORMAT: Final = 'Error: Formato requerido: commit -m "<mensaje>"'
+_ERR_BRANCH_NAME: Final = "Error: Branch name required"
+# Error del CLI cuando sobran argumentos
+_ERR_TOO_MANY_ARGS: Final = "Error: Demasiados argumentos"
+
+# Separador entre commits en la salida de log
+_LOG_SEPARATOR: Final = "-" * 40
+
+# Plantilla de salida de 'pr status'
+_PR_STATUS_TMPL: Final = (
+    "Pull Request: {id}\n"
+    "Título: {title}\n"
+    "Estado: {status}\n"
+    "Autor: {author}\n"
+    "Creado: {created_at}\n"
+    "Origen: {source}\n"
+    "Destino: {target}\n"
+    "Revisores: {reviewers}\n"
+    "Etiquetas: {tags}\n"
+    "Archivos modificados: {files}\n"
+    "Descripción:\n{description}"
+)
+
+# Número de argumentos aceptado por un comando y error si faltan
+class ArgSpec:
+    __slots__ = ("min", "max", "usage")
+    
+    def __init__(self, min_args: int, max_args: Optional[int], usage: str = ""):
+        self.min = min_args
+        self.max = max_args  # None: sin límite (mensajes y descripciones libres)
+        self.usage = usage
+    
+    def check(self, args: Tuple[str, ...]) -> Optional[str]:
+        """Devuelve el mensaje de error si args no cumple la especificación."""
+        if len(args) < self.min:
+            return self.usage
+        if self.max is not None and len(args) > self.max:
+            return _ERR_TOO_MANY_ARGS
+        return None
+
+# Interfaz estructural de los manejadores (sin coste en tiempo de ejecución).
+# repo es el repositorio actual ya validado; los comandos registrados con
+# needs_repo=False (init) aceptan además None y declaran Optional[Repository].
+class Command(Protocol):
+    def __call__(self, rm: RepositoryManager, repo: Repository,
+                 args: Tuple[str, ...]) -> str:
+        """Ejecuta el comando y devuelve el resultado como cadena."""
+        ...
 
 # Comando para inicializar un repositorio
-class InitCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if len(args) < 2:
-            return "Error: Argumentos requeridos: <nombre> <ruta>"
-        nombre, ruta = args[0], args[1]
-        self.repo_manager.create_repository(nombre, ruta)
-        return f"Repositorio Git vacío inicializado '{nombre}' en '{ruta}'"
-    
-    def get_help(self) -> str:
-        return "git init <nombre> <ruta> - Crea un nuevo repositorio"
+def _do_init(rm: RepositoryManager, repo: Optional[Repository], args: Tuple[str, ...]) -> str:
+    nombre, ruta = args[0], args[1]
+    rm.create_repository(nombre, ruta)
+    return f"Repositorio Git vacío inicializado '{nombre}' en '{ruta}'"
 
 # Comando para añadir archivos al área de staging
-class AddCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if not args:
-            return "Error: Argumento requerido: <archivo>"
-        
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        nombre_archivo = args[0]
-        try:
-            with open(nombre_archivo, 'r') as f:
-                contenido = f.read()
-            repo.add(nombre_archivo, contenido)
-            return f"Añadido {nombre_archivo} al área de staging"
-        except FileNotFoundError:
-            return f"Error: Archivo '{nombre_archivo}' no encontrado"
-    
-    def get_help(self) -> str:
-        return "git add <archivo> - Añade archivo al área de staging"
+def _do_add(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    nombre_archivo = args[0]
+    try:
+        with open(nombre_archivo, 'rb', buffering=1 << 20) as f:
+            repo.add_stream(nombre_archivo, f)
+        return f"Añadido {nombre_archivo} al área de staging"
+    except FileNotFoundError:
+        return f"Error: Archivo '{nombre_archivo}' no encontrado"
 
 # Comando para crear un nuevo commit
-class CommitCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if len(args) < 2 or args[0] != '-m':
-            return 'Error: Formato requerido: commit -m "<mensaje>"'
-        
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        mensaje = args[1]
-        try:
-            commit_id = repo.commit(mensaje, "user@example.com")
-            return f"Commit creado {commit_id}"
-        except ValueError as e:
-            return f"Error: {str(e)}"
-    
-    def get_help(self) -> str:
-        return 'git commit -m "<mensaje>" - Crea un nuevo commit'
+def _do_commit(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    if args[0] != '-m':
+        return _ERR_COMMIT_FORMAT
 
-class BranchCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No repository selected"
-        
-        # Si no hay argumentos, listar las ramas
-        if not args:
-            branches = repo.list_branches()
-            current = repo.current_branch
-            output = []
-            for branch in branches:
-                prefix = "* " if branch == current else "  "
-                output.append(f"{prefix}{branch}")
-            return "\n".join(output) if output else "No branches exist yet"
-        
-        # Crear nueva rama
-        branch_name = args[0]
-        try:
-            repo.branch(branch_name)
-            return f"Created branch '{branch_name}'"
-        except ValueError as e:
-            return f"Error: {str(e)}"
-    
-    def get_help(self) -> str:
-        return "git branch [<branch-name>] - List or create branches"
+    mensaje = " ".join(args[1:])
+    try:
+        commit_id = repo.commit(mensaje, "user@example.com")
+        return f"Commit creado {commit_id}"
+    except ValueError as e:
+        return f"Error: {str(e)}"
 
-class CheckoutCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if not args:
-            return "Error: Required argument: <branch-name> or <commit-id> or -b <new-branch>"
-        
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        # Crear y cambiar a nueva rama
-        if args[0] == '-b':
-            if len(args) < 2:
-                return "Error: Branch name required"
-            branch_name = args[1]
-            try:
-                repo.branch(branch_name)
-                repo.checkout(branch_name)
-                return f"Switched to a new branch '{branch_name}'"
-            except ValueError as e:
-                return f"Error: {str(e)}"
-        
-        # Cambiar a rama o commit existente
-        target = args[0]
-        try:
-            # Intentar cambiar a una rama primero
-            if target in repo.branches:
-                repo.checkout(target)
-                return f"Switched to branch '{target}'"
-            # Si no es una rama, intentar cambiar a un commit
-            repo.checkout_commit(target)
-            return f"HEAD is now at {target}"
-        except ValueError as e:
-            return f"Error: {str(e)}"
-    
-    def get_help(self) -> str:
-        return "git checkout [-b] <branch-name> | <commit-id> - Switch branches or restore working tree files"
+def _do_branch(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    # Si no hay argumentos, listar las ramas
+    if not args:
+        branches = repo.list_branches()
+        current = repo.current_branch
+        output = []
+        for branch in branches:
+            prefix = "* " if branch == current else "  "
+            output.append(f"{prefix}{branch}")
+        return "\n".join(output) if output else "No branches exist yet"
+
+    # Crear nueva rama
+    branch_name = args[0]
+    try:
+        repo.branch(branch_name)
+        return f"Created branch '{branch_name}'"
+    except ValueError as e:
+        return f"Error: {str(e)}"
+
+# Crear y cambiar a nueva rama (checkout -b <rama>)
+def _checkout_new_branch(repo: Repository, args: Tuple[str, ...]) -> str:
+    if len(args) < 2:
+        return _ERR_BRANCH_NAME
+    branch_name = args[1]
+    try:
+        repo.branch(branch_name)
+        repo.checkout(branch_name)
+        return f"Switched to a new branch '{branch_name}'"
+    except ValueError as e:
+        return f"Error: {str(e)}"
+
+# Cambiar a rama o commit existente (checkout <rama> | <commit>)
+def _checkout_target(repo: Repository, args: Tuple[str, ...]) -> str:
+    # Sólo '-b' admite un segundo argumento
+    if len(args) > 1:
+        return _ERR_TOO_MANY_ARGS
+    target = args[0]
+    try:
+        # Intentar cambiar a una rama primero (branches es un dict: búsqueda O(1))
+        if target in repo.branches:
+            repo.checkout(target)
+            return f"Switched to branch '{target}'"
+        # Si no es una rama, intentar cambiar a un commit
+        repo.checkout_commit(target)
+        return f"HEAD is now at {target}"
+    except ValueError as e:
+        return f"Error: {str(e)}"
+
+# Opciones de checkout con su propio manejador; cualquier otro argumento es un destino
+_CHECKOUT_FLAGS: Dict[str, Callable[[Repository, Tuple[str, ...]], str]] = {
+    '-b': _checkout_new_branch,
+}
+
+def _do_checkout(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    return _CHECKOUT_FLAGS.get(args[0], _checkout_target)(repo, args)
 
 # Comando para ver el estado del repositorio
-class StatusCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        status_list = repo.status()
-        output = [f"On branch {repo.current_branch}"]
-        
-        if not status_list:
-            output.append("Nothing to commit, working tree clean")
-        else:
-            output.append("\nChanges not staged for commit:")
-            for status in status_list:
-                output.append(f"  {status.status}: {status.path}")
-        
-        return "\n".join(output)
-    
-    def get_help(self) -> str:
-        return "git status - Muestra el estado del árbol de trabajo"
+def _do_status(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    status_list = repo.status()
+    header = f"On branch {repo.current_branch}"
+
+    if not status_list:
+        return header + "\nNothing to commit, working tree clean"
+    return header + "\n\nChanges not staged for commit:\n" + "\n".join(
+        f"  {status.status}: {status.path}" for status in status_list
+    )
 
 # Comando para ver el historial de commits
-class LogCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        historial = repo.get_commit_history()
-        if not historial:
-            return "Aún no hay commits"
-        
-        salida = []
-        for commit in historial:
-            salida.extend([
-                f"Commit: {commit.id}",
-                f"Autor: {commit.author_email}",
-                f"Fecha: {commit.timestamp}",
-                f"Rama: {commit.branch}",
-                f"\n    {commit.message}\n",
-                "-" * 40
-            ])
-        return "\n".join(salida)
-    
-    def get_help(self) -> str:
-        return "git log - Muestra el historial de commits"
+def _do_log(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    historial = repo.get_commit_history()
+    if not historial:
+        return "Aún no hay commits"
+
+    return "\n".join([
+        f"Commit: {c.id}\n"
+        f"Autor: {c.author_email}\n"
+        f"Fecha: {c.timestamp}\n"
+        f"Rama: {c.branch}\n"
+        f"\n    {c.message}\n\n"
+        f"{_LOG_SEPARATOR}"
+        for c in historial
+    ])
 
 # Comandos para Pull Requests (PRs):
 
 # Comando para crear un PR
-class PRCreateCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if len(args) < 4:
-            return "Error: Argumentos requeridos: <título> <rama_origen> <rama_destino> <descripción>"
-        
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        titulo, rama_origen, rama_destino, *partes_desc = args
-        descripcion = " ".join(partes_desc)
-        
-        try:
-            pr_id = repo.create_pull_request(
-                title=titulo,
-                description=descripcion,
-                source_branch=rama_origen,
-                target_branch=rama_destino,
-                author="user@example.com"
-            )
-            return f"Pull request creado {pr_id}"
-        except ValueError as e:
-            return f"Error: {str(e)}"
-    
-    def get_help(self) -> str:
-        return "git pr create <título> <rama_origen> <rama_destino> <descripción> - Crea un nuevo pull request"
+def _do_pr_create(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    titulo, rama_origen, rama_destino, *partes_desc = args
+    descripcion = partes_desc[0] if len(partes_desc) == 1 else " ".join(partes_desc)
 
-# Comando para ver estado de un PR
-class PRStatusCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if not args:
-            return "Error: Argumento requerido: <pr_id>"
-        
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        pr_id = args[0]
-        pr = repo.get_pull_request(pr_id)
-        if not pr:
-            return f"Error: Pull request '{pr_id}' no encontrado"
-        
-        return (
-            f"Pull Request: {pr.id}\n"
-            f"Título: {pr.title}\n"
-            f"Estado: {pr.status}\n"
-            f"Autor: {pr.author}\n"
-            f"Creado: {pr.created_at}\n"
-            f"Origen: {pr.source_branch}\n"
-            f"Destino: {pr.target_branch}\n"
-            f"Revisores: {', '.join(pr.reviewers) if pr.reviewers else 'Ninguno'}\n"
-            f"Etiquetas: {', '.join(pr.tags) if pr.tags else 'Ninguna'}\n"
-            f"Archivos modificados: {', '.join(pr.modified_files)}\n"
-            f"Descripción:\n{pr.description}"
+    try:
+        pr_id = repo.create_pull_request(
+            title=titulo,
+            description=descripcion,
+            source_branch=rama_origen,
+            target_branch=rama_destino,
+            author="user@example.com"
         )
-    
-    def get_help(self) -> str:
-        return "git pr status <pr_id> - Muestra el estado de un pull request"
-
-# Comando para añadir revisor a un PR
-class PRReviewCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if len(args) < 2:
-            return "Error: Argumentos requeridos: <pr_id> <email_revisor>"
-        
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        pr_id, revisor = args
-        try:
-            repo.review_pull_request(pr_id, revisor)
-            return f"Revisor {revisor} añadido al pull request {pr_id}"
-        except ValueError as e:
-            return f"Error: {str(e)}"
-    
-    def get_help(self) -> str:
-        return "git pr review <pr_id> <email_revisor> - Añade un revisor a un pull request"
+        return f"Pull request creado {pr_id}"
+    except ValueError as e:
+        return f"Error: {str(e)}"
 
-# Comando para aprobar un PR
-class PRApproveCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if not args:
-            return "Error: Argumento requerido: <pr_id>"
-        
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        pr_id = args[0]
-        try:
-            repo.approve_pull_request(pr_id)
-            return f"Pull request {pr_id} aprobado"
-        except ValueError as e:
-            return f"Error: {str(e)}"
-    
-    def get_help(self) -> str:
-        return "git pr approve <pr_id> - Aprueba un pull request"
+# Comando para ver estado de un PR
+def _do_pr_status(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    pr_id = args[0]
+    pr = repo.get_pull_request(pr_id)
+    if not pr:
+        return f"Error: Pull request '{pr_id}' no encontrado"
 
-# Comando para rechazar un PR
-class PRRejectCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if not args:
-            return "Error: Argumento requerido: <pr_id>"
-        
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        pr_id = args[0]
-        try:
-            repo.reject_pull_request(pr_id)
-            return f"Pull request {pr_id} rechazado"
-        except ValueError as e:
-            return f"Error: {str(e)}"
-    
-    def get_help(self) -> str:
-        return "git pr reject <pr_id> - Rechaza un pull request"
+    return _PR_STATUS_TMPL.format_map({
+        'id': pr.id,
+        'title': pr.title,
+        'status': PR_STATUS_LABELS[pr.status],
+        'author': pr.author,
+        'created_at': pr.created_at,
+        'source': pr.source_branch,
+        'target': pr.target_branch,
+        'reviewers': pr.joined('reviewers') or 'Ninguno',
+        'tags': pr.joined('tags') or 'Ninguna',
+        'files': pr.joined('modified_files'),
+        'description': pr.description,
+    })
 
-# Comando para cancelar un PR
-class PRCancelCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if not args:
-            return "Error: Argumento requerido: <pr_id>"
-        
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        pr_id = args[0]
+# Manejador genérico: llama a repo.<method_name>(*args) y formatea ok_fmt con esos
+# mismos argumentos. Cubre los comandos de PR que sólo mutan un PR por ID.
+def _simple(method_name: str, ok_fmt: str) -> Command:
+    def handler(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
         try:
-            repo.cancel_pull_request(pr_id)
-            return f"Pull request {pr_id} cancelado"
+            getattr(repo, method_name)(*args)
+            return ok_fmt.format(*args)
         except ValueError as e:
             return f"Error: {str(e)}"
-    
-    def get_help(self) -> str:
-        return "git pr cancel <pr_id> - Cancela un pull request"
+    return handler
 
 # Comando para listar todos los PRs
-class PRListCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        prs = repo.list_pull_requests()
-        if not prs:
-            return "No se encontraron pull requests"
-        
-        salida = ["Pull Requests:"]
-        for pr in prs:
-            salida.append(
-                f"  {pr.id}: {pr.title} ({pr.status})\n"
-                f"    Origen: {pr.source_branch} → Destino: {pr.target_branch}"
-            )
-        return "\n".join(salida)
-    
-    def get_help(self) -> str:
-        return "git pr list - Lista todos los pull requests"
+def _do_pr_list(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    prs = repo.list_pull_requests()
+    if not prs:
+        return "No se encontraron pull requests"
+
+    return "Pull Requests:\n" + "\n".join(
+        f"  {pr.id}: {pr.title} ({PR_STATUS_LABELS[pr.status]})\n"
+        f"    Origen: {pr.source_branch} → Destino: {pr.target_branch}"
+        for pr in prs
+    )
 
 # Comando para ver el siguiente PR en cola
-class PRNextCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        pr = repo.get_next_pull_request()
-        if not pr:
-            return "No hay pull requests en cola"
-        
-        return (
-            f"Siguiente Pull Request:\n"
-            f"  ID: {pr.id}\n"
-            f"  Título: {pr.title}\n"
-            f"  Estado: {pr.status}\n"
-            f"  Origen: {pr.source_branch} → Destino: {pr.target_branch}"
-        )
-    
-    def get_help(self) -> str:
-        return "git pr next - Muestra el siguiente pull request en cola"
+def _do_pr_next(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    pr = repo.get_next_pull_request()
+    if not pr:
+        return "No hay pull requests en cola"
 
-# Comando para etiquetar un PR
-class PRTagCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        if len(args) < 2:
-            return "Error: Argumentos requeridos: <pr_id> <etiqueta>"
-        
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        pr_id, etiqueta = args
-        try:
-            repo.tag_pull_request(pr_id, etiqueta)
-            return f"Etiqueta '{etiqueta}' añadida al pull request {pr_id}"
-        except ValueError as e:
-            return f"Error: {str(e)}"
-    
-    def get_help(self) -> str:
-        return "git pr tag <pr_id> <etiqueta> - Añade una etiqueta a un pull request"
+    return (
+        f"Siguiente Pull Request:\n"
+        f"  ID: {pr.id}\n"
+        f"  Título: {pr.title}\n"
+        f"  Estado: {PR_STATUS_LABELS[pr.status]}\n"
+        f"  Origen: {pr.source_branch} → Destino: {pr.target_branch}"
+    )
 
 # Comando para limpiar todos los PRs
-class PRClearCommand(Command):
-    def __init__(self, repo_manager: RepositoryManager):
-        self.repo_manager = repo_manager
-    
-    def execute(self, *args) -> str:
-        repo = self.repo_manager.current_repository
-        if not repo:
-            return "Error: No hay repositorio seleccionado"
-        
-        repo.clear_pull_requests()
-        return "Todos los pull requests han sido eliminados"
-    
-    def get_help(self) -> str:
-        return "git pr clear - Elimina todos los pull requests"
\ No newline at end of file
+def _do_pr_clear(rm: RepositoryManager, repo: Repository, args: Tuple[str, ...]) -> str:
+    repo.clear_pull_requests()
+    return "Todos los pull requests han sido eliminados"
+
+# Tabla de comandos: clave -> (manejador, ayuda, argumentos, requiere repositorio).
+# Los subcomandos de PR usan la clave 'pr <subcomando>'.
+HANDLERS: Dict[str, Tuple[Command, str, ArgSpec, bool]] = {
+    'init': (_do_init, "git init <nombre> <ruta> - Crea un nuevo repositorio",
+             ArgSpec(2, 2, "Error: Argumentos requeridos: <nombre> <ruta>"), False),
+    'add': (_do_add, "git add <archivo> - Añade archivo al área de staging",
+            ArgSpec(1, 1, "Error: Argumento requerido: <archivo>"), True),
+    'commit': (_do_commit, 'git commit -m "<mensaje>" - Crea un nuevo commit',
+               ArgSpec(2, None, _ERR_COMMIT_FORMAT), True),
+    'branch': (_do_branch, "git branch [<branch-name>] - List or create branches",
+               ArgSpec(0, 1), True),
+    'checkout': (_do_checkout, "git checkout [-b] <branch-name> | <commit-id> - Switch branches or restore working tree files",
+                 ArgSpec(1, 2, "Error: Required argument: <branch-name> or <commit-id> or -b <new-branch>"), True),
+    'status': (_do_status, "git status - Muestra el estado del árbol de trabajo",
+               ArgSpec(0, 0), True),
+    'log': (_do_log, "git log - Muestra el historial de commits",
+            ArgSpec(0, 0), True),
+    'pr create': (_do_pr_create, "git pr create <título> <rama_origen> <rama_destino> <descripción> - Crea un nuevo pull request",
+                  ArgSpec(4, None, "Error: Argumentos requeridos: <título> <rama_origen> <rama_destino> <descripción>"), True),
+    'pr status': (_do_pr_status, "git pr status <pr_id> - Muestra el estado de un pull request",
+                  ArgSpec(1, 1, "Error: Argumento requerido: <pr_id>"), True),
+    'pr review': (_simple('review_pull_request', "Revisor {1} añadido al pull request {0}"),
+                  "git pr review <pr_id> <email_revisor> - Añade un revisor a un pull request",
+                  ArgSpec(2, 2, "Error: Argumentos requeridos: <pr_id> <email_revisor>"), True),
+    'pr approve': (_simple('approve_pull_request', "Pull request {0} aprobado"),
+                   "git pr approve <pr_id> - Aprueba un pull request",
+                   ArgSpec(1, 1, "Error: Argumento requerido: <pr_id>"), True),
+    'pr reject': (_simple('reject_pull_request', "Pull request {0} rechazado"),
+                  "git pr reject <pr_id> - Rechaza un pull request",
+                  ArgSpec(1, 1, "Error: Argumento requerido: <pr_id>"), True),
+    'pr cancel': (_simple('cancel_pull_request', "Pull request {0} cancelado"),
+                  "git pr cancel <pr_id> - Cancela un pull request",
+                  ArgSpec(1, 1, "Error: Argumento requerido: <pr_id>"), True),
+    'pr list': (_do_pr_list, "git pr list - Lista todos los pull requests",
+                ArgSpec(0, 0), True),
+    'pr next': (_do_pr_next, "git pr next - Muestra el siguiente pull request en cola",
+                ArgSpec(0, 0), True),
+    'pr tag': (_simple('tag_pull_request', "Etiqueta '{1}' añadida al pull request {0}"),
+               "git pr tag <pr_id> <etiqueta> - Añade una etiqueta a un pull request",
+               ArgSpec(2, 2, "Error: Argumentos requeridos: <pr_id> <etiqueta>"), True),
+    'pr clear': (_do_pr_clear, "git pr clear - Elimina todos los pull requests",
+                 ArgSpec(0, 0), True),
+}
+
+# Claves internadas: las búsquedas con cadenas internadas se resuelven por identidad
+HANDLERS = {sys.intern(key): entry for key, entry in HANDLERS.items()}
+
+# Líneas de ayuda agrupadas por comando de primer nivel, calculadas una sola vez
+HELP_SECTIONS: Tuple[Tuple[str, str], ...] = tuple(
+    (key, help_str) for key, (_, help_str, *_) in HANDLERS.items() if not key.startswith('pr ')
+) + (('pr', "\n".join(
+    ["\npr subcomandos:"] +
+    [f"  {help_str}" for key, (_, help_str, *_) in HANDLERS.items() if key.startswith('pr ')]
+)),)
+
+# Ayuda completa cuando todos los comandos están habilitados (caso por defecto)
+ALL_HELP: Final = "\n".join(["Available commands:"] + [text for _, text in HELP_SECTIONS])
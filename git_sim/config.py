@@ -1,48 +1,144 @@
 """
 Gestión de configuración para el sistema de simulación Git.
 """
+import atexit
 import json
-from typing import Dict, Set
+import os
+import threading
+import weakref
+from typing import Dict, FrozenSet, Iterable, Optional
+
+# Comandos conocidos: cada uno ocupa un bit de la máscara de habilitados
+_KNOWN_COMMANDS = ('init', 'add', 'commit', 'branch', 'checkout', 'status', 'log', 'pr')
+
+# Espera desde el primer cambio pendiente hasta escribir el archivo en segundo plano (segundos)
+_SAVE_DELAY = 0.1
+
+# Configuraciones vivas con posibles cambios pendientes; un único hook de atexit
+# las guarda todas sin mantenerlas vivas hasta el final del intérprete
+_live_configs: "weakref.WeakSet[Config]" = weakref.WeakSet()
+
+def _flush_all() -> None:
+    for config in list(_live_configs):
+        config.flush()
+
+atexit.register(_flush_all)
 
 class Config:
     def __init__(self, config_file: str = "git_sim_config.json"):
         # Archivo de configuración y comandos habilitados
         self.config_file = config_file
-        self.enabled_commands: Set[str] = set()
+        # Comandos habilitados como máscara de bits (nombre -> bit)
+        self._bits: Dict[str, int] = {name: 1 << i for i, name in enumerate(_KNOWN_COMMANDS)}
+        self._mask = 0
+        self.version = 0  # Se incrementa en cada cambio de comandos habilitados
+        self._dirty = False  # Hay cambios pendientes de guardar
+        self._compact_on_disk = False  # La última escritura fue JSON compacto
+        self._pending_save: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
         self.load_config()
+        _live_configs.add(self)
+    
+    @property
+    def enabled_commands(self) -> FrozenSet[str]:
+        """Conjunto (inmutable) de comandos habilitados."""
+        return frozenset(name for name, bit in self._bits.items() if self._mask & bit)
+    
+    @enabled_commands.setter
+    def enabled_commands(self, commands: Iterable[str]) -> None:
+        """Reemplaza los comandos habilitados (el guardado se agrupa en segundo plano)."""
+        with self._lock:
+            self._set_enabled(commands)
+            self._schedule_save()
+    
+    def _set_enabled(self, commands: Iterable[str]) -> None:
+        """Reconstruye la máscara de bits a partir de los nombres de comandos."""
+        mask = 0
+        for command in commands:
+            mask |= self._bit(command)
+        self._mask = mask
+    
+    def _bit(self, command: str) -> int:
+        """Devuelve el bit de un comando, asignando uno nuevo si no era conocido."""
+        bit = self._bits.get(command)
+        if bit is None:
+            bit = self._bits[command] = 1 << len(self._bits)
+        return bit
     
     def load_config(self) -> None:
         """Carga la configuración desde el archivo."""
         try:
             with open(self.config_file, 'r') as f:
                 config = json.load(f)
-                self.enabled_commands = set(config.get('enabled_commands', []))
+                self._set_enabled(config.get('enabled_commands', []))
+                self.version += 1
         except FileNotFoundError:
             # Configuración por defecto con todos los comandos habilitados
-            self.enabled_commands = {
+            self._set_enabled((
                 'init', 'add', 'commit', 'branch', 'checkout', 'status', 'log',
                 'pr'  # PR commands are handled as subcommands
-            }
+            ))
+            self.version += 1
             self.save_config()
     
-    def save_config(self) -> None:
-        """Guarda la configuración en el archivo."""
+    def save_config(self, pretty: bool = False) -> None:
+        """Guarda la configuración en el archivo (JSON compacto salvo pretty=True)."""
         config = {
-            'enabled_commands': list(self.enabled_commands)
+            'enabled_commands': [name for name, bit in self._bits.items() if self._mask & bit]
         }
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        # Escribe a un archivo temporal y lo reemplaza de forma atómica
+        tmp_file = f"{self.config_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            if pretty:
+                json.dump(config, f, indent=2)
+            else:
+                json.dump(config, f, separators=(",", ":"))
+        os.replace(tmp_file, self.config_file)
+        self._dirty = False
+        self._compact_on_disk = not pretty
+    
+    def flush(self, pretty: bool = True) -> None:
+        """Guarda la configuración si hay cambios pendientes.
+        
+        Los guardados en segundo plano pasan pretty=False y escriben JSON
+        compacto. El guardado explícito (y el de atexit) deja el archivo legible:
+        si la última escritura fue compacta se reescribe indentada aunque no
+        haya cambios nuevos.
+        """
+        with self._lock:
+            if self._pending_save is not None:
+                self._pending_save.cancel()
+                self._pending_save = None
+            if self._dirty or (pretty and self._compact_on_disk):
+                self.save_config(pretty)
+    
+    def _schedule_save(self) -> None:
+        """Marca cambios pendientes y programa el guardado en segundo plano.
+        
+        Si ya hay un guardado programado no se crea otro: los cambios que lleguen
+        antes de que se ejecute se escriben juntos. Debe llamarse con self._lock
+        adquirido.
+        """
+        self._dirty = True
+        self.version += 1
+        if self._pending_save is not None:
+            return
+        self._pending_save = threading.Timer(_SAVE_DELAY, self.flush, kwargs={'pretty': False})
+        self._pending_save.daemon = True  # flush() en atexit cubre el guardado final
+        self._pending_save.start()
     
     def is_command_enabled(self, command: str) -> bool:
         """Verifica si un comando está habilitado."""
-        return command in self.enabled_commands
+        return bool(self._mask & self._bits.get(command, 0))
     
     def enable_command(self, command: str) -> None:
-        """Habilita un comando."""
-        self.enabled_commands.add(command)
-        self.save_config()
+        """Habilita un comando (el guardado se agrupa en segundo plano)."""
+        with self._lock:
+            self._mask |= self._bit(command)
+            self._schedule_save()
     
     def disable_command(self, command: str) -> None:
-        """Deshabilita un comando."""
-        self.enabled_commands.discard(command)
-        self.save_config()
\ No newline at end of file
+        """Deshabilita un comando (el guardado se agrupa en segundo plano)."""
+        with self._lock:
+            self._mask &= ~self._bits.get(command, 0)
+            self._schedule_save()
\ No newline at end of file
@@ -1,151 +1,200 @@
 """
 Estructuras de datos centrales para el sistema de simulación Git.
 """
-from typing import Any, Optional, List, Dict, Set
-from dataclasses import dataclass
+from collections import deque
+from typing import Any, Deque, FrozenSet, Iterator, Optional, List, Dict, Set
+from dataclasses import dataclass, field
 from datetime import datetime
+from enum import IntEnum
 
-# Nodo básico para estructuras enlazadas
+# Nodo básico de la lista enlazada
 class Node:
+    __slots__ = ("data", "next", "prev")
+    
     def __init__(self, data: Any):
         self.data = data
         self.next: Optional[Node] = None
+        self.prev: Optional[Node] = None  # Permite desenlazar el nodo en O(1)
 
-# Implementación de cola (FIFO)
+# Implementación de cola (FIFO) sobre collections.deque
 class Queue:
     def __init__(self):
-        self.front: Optional[Node] = None  # Frente de la cola
-        self.rear: Optional[Node] = None   # Final de la cola
-        self.size = 0
+        self._items: Deque[Any] = deque()
+    
+    @property
+    def size(self) -> int:
+        """Número de elementos en la cola."""
+        return len(self._items)
+    
+    def __iter__(self) -> Iterator[Any]:
+        """Recorre la cola desde el frente sin desencolar."""
+        return iter(self._items)
     
     def enqueue(self, data: Any) -> None:
         """Añade un elemento al final de la cola."""
-        new_node = Node(data)
-        if self.rear is None:
-            self.front = new_node
-            self.rear = new_node
-        else:
-            self.rear.next = new_node
-            self.rear = new_node
-        self.size += 1
+        self._items.append(data)
     
     def dequeue(self) -> Optional[Any]:
         """Elimina y devuelve el elemento del frente de la cola."""
-        if self.front is None:
-            return None
-        
-        data = self.front.data
-        self.front = self.front.next
-        self.size -= 1
-        
-        if self.front is None:
-            self.rear = None
-        
-        return data
+        return self._items.popleft() if self._items else None
     
     def peek(self) -> Optional[Any]:
         """Mira el elemento del frente sin eliminarlo."""
-        return self.front.data if self.front else None
+        return self._items[0] if self._items else None
     
     def is_empty(self) -> bool:
         """Verifica si la cola está vacía."""
-        return self.size == 0
+        return not self._items
     
     def clear(self) -> None:
         """Limpia todos los elementos de la cola."""
-        self.front = None
-        self.rear = None
-        self.size = 0
+        self._items.clear()
 
-# Implementación de pila (LIFO)
+# Implementación de pila (LIFO) sobre una lista de Python
 class Stack:
     def __init__(self):
-        self.top: Optional[Node] = None  # Tope de la pila
-        self.size = 0
+        self._items: List[Any] = []  # El tope es el último elemento
+    
+    @property
+    def size(self) -> int:
+        """Número de elementos en la pila."""
+        return len(self._items)
     
     def push(self, data: Any) -> None:
         """Apila un elemento."""
-        new_node = Node(data)
-        new_node.next = self.top
-        self.top = new_node
-        self.size += 1
+        self._items.append(data)
     
     def pop(self) -> Optional[Any]:
         """Desapila un elemento."""
-        if not self.top:
-            return None
-        data = self.top.data
-        self.top = self.top.next
-        self.size -= 1
-        return data
+        return self._items.pop() if self._items else None
     
     def peek(self) -> Optional[Any]:
         """Mira el elemento del tope sin eliminarlo."""
-        return self.top.data if self.top else None
+        return self._items[-1] if self._items else None
     
     def is_empty(self) -> bool:
         """Verifica si la pila está vacía."""
-        return self.size == 0
+        return not self._items
     
     def clear(self) -> None:
         """Limpia todos los elementos de la pila."""
-        self.top = None
-        self.size = 0
+        self._items.clear()
 
-# Implementación de lista enlazada
+# Implementación de lista enlazada: los nodos se guardan en orden en una lista
+# de Python, de modo que añadir al final es O(1) en lugar de recorrer la cadena,
+# y un índice por valor resuelve find y remove en O(1) para datos hashables.
+# Eliminar deja una marca (None) en la lista; cuando las marcas superan a los
+# nodos vivos se compacta, así que el coste amortizado sigue siendo O(1)
 class LinkedList:
     def __init__(self):
-        self.head: Optional[Node] = None
+        self._nodes: List[Optional[Node]] = []  # None marca un nodo eliminado
+        self._live = 0  # Nodos no eliminados
+        self._index: Dict[Any, List[int]] = {}  # dato -> posiciones en _nodes (en orden)
+        self._head: Optional[Node] = None
+        self._tail: Optional[Node] = None
+    
+    @property
+    def head(self) -> Optional[Node]:
+        """Primer nodo de la lista."""
+        return self._head
     
     def append(self, data: Any) -> None:
         """Añade un elemento al final de la lista."""
         new_node = Node(data)
-        if not self.head:
-            self.head = new_node
-            return
-        current = self.head
-        while current.next:
-            current = current.next
-        current.next = new_node
+        if self._tail is not None:
+            self._tail.next = new_node
+            new_node.prev = self._tail
+        else:
+            self._head = new_node
+        self._tail = new_node
+        try:
+            self._index.setdefault(data, []).append(len(self._nodes))
+        except TypeError:
+            pass  # Dato no hashable: find y remove recurren al recorrido lineal
+        self._nodes.append(new_node)
+        self._live += 1
     
     def remove(self, data: Any) -> bool:
         """Elimina un elemento de la lista."""
-        if not self.head:
-            return False
-        
-        if self.head.data == data:
-            self.head = self.head.next
-            return True
-        
-        current = self.head
-        while current.next:
-            if current.next.data == data:
-                current.next = current.next.next
-                return True
-            current = current.next
-        return False
+        try:
+            positions = self._index.get(data)
+            if not positions:
+                return False
+            i = positions.pop(0)  # Primera aparición del dato
+            if not positions:
+                del self._index[data]
+        except TypeError:
+            i = self._scan_position(data)
+            if i < 0:
+                return False
+        node = self._nodes[i]
+        self._nodes[i] = None
+        self._unlink(node)
+        self._live -= 1
+        if len(self._nodes) > 2 * self._live:
+            self._compact()
+        return True
+    
+    def _unlink(self, node: Node) -> None:
+        """Saca un nodo de la cadena enlazando a sus vecinos."""
+        if node.prev is not None:
+            node.prev.next = node.next
+        else:
+            self._head = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        else:
+            self._tail = node.prev
+        node.prev = node.next = None
+    
+    def _compact(self) -> None:
+        """Quita las marcas de eliminados y reconstruye el índice de posiciones."""
+        self._nodes = [node for node in self._nodes if node is not None]
+        self._index = {}
+        for i, node in enumerate(self._nodes):
+            try:
+                self._index.setdefault(node.data, []).append(i)
+            except TypeError:
+                pass
+    
+    def _scan_position(self, data: Any) -> int:
+        """Posición del primer nodo vivo con el dato, o -1 si no está."""
+        for i, node in enumerate(self._nodes):
+            if node is not None and node.data == data:
+                return i
+        return -1
+    
+    def _scan(self, data: Any) -> Optional[Node]:
+        """Busca un elemento recorriendo la lista."""
+        i = self._scan_position(data)
+        return self._nodes[i] if i >= 0 else None
     
     def find(self, data: Any) -> Optional[Node]:
         """Busca un elemento en la lista."""
-        current = self.head
-        while current:
-            if current.data == data:
-                return current
-            current = current.next
-        return None
+        try:
+            positions = self._index.get(data)
+        except TypeError:
+            return self._scan(data)
+        return self._nodes[positions[0]] if positions else None
     
     def to_list(self) -> List[Any]:
         """Convierte la lista enlazada a una lista Python."""
-        result = []
-        current = self.head
-        while current:
-            result.append(current.data)
-            current = current.next
-        return result
+        return [node.data for node in self._nodes if node is not None]
 
 # Clases de datos para el sistema Git:
 
-@dataclass
+class PRStatus(IntEnum):
+    """Estados de un pull request."""
+    OPEN = 0
+    APPROVED = 1
+    REJECTED = 2
+    CANCELLED = 3
+    MERGED = 4
+
+# Texto mostrado para cada estado, indexado por PRStatus
+PR_STATUS_LABELS = ("open", "approved", "rejected", "cancelled", "merged")
+
+@dataclass(slots=True)
 class PullRequest:
     """Representa un pull request."""
     id: str  # Identificador único
@@ -156,38 +205,66 @@ class PullRequest:
     source_branch: str  # Rama origen
     target_branch: str  # Rama destino
     commit_ids: List[str]  # IDs de commits asociados
-    modified_files: Set[str]  # Archivos modificados
     reviewers: Set[str]  # Revisores
     closed_at: Optional[datetime] = None  # Fecha cierre
     merged_at: Optional[datetime] = None  # Fecha fusión
-    status: str = "open"  # Estados: open, approved, rejected, cancelled, merged
+    status: PRStatus = PRStatus.OPEN  # Estado actual del PR
     tags: Set[str] = None  # Etiquetas
+    # Commits del repositorio (ID -> Commit) de los que se obtienen los archivos modificados
+    commits: Optional[Dict[str, "Commit"]] = field(default=None, repr=False, compare=False)
+    # Archivos modificados, calculados en el primer acceso a modified_files
+    _modified_files: Optional[Set[str]] = field(default=None, init=False, repr=False, compare=False)
+    # Conjuntos ya unidos con ', ' para mostrarlos (atributo -> texto)
+    _rendered: Dict[str, str] = field(default_factory=dict, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.tags is None:
             self.tags = set()
+    
+    @property
+    def modified_files(self) -> Set[str]:
+        """Archivos modificados por los commits del PR."""
+        if self._modified_files is None:
+            commits = self.commits
+            self._modified_files = set() if commits is None else set().union(
+                *(commits[commit_id].modified_paths for commit_id in self.commit_ids)
+            )
+        return self._modified_files
+    
+    def joined(self, attr: str) -> str:
+        """Devuelve el conjunto `attr` unido con ', ', memorizado hasta que cambie."""
+        text = self._rendered.get(attr)
+        if text is None:
+            text = self._rendered[attr] = ", ".join(getattr(self, attr))
+        return text
+    
+    def invalidate(self, attr: str) -> None:
+        """Descarta el texto memorizado de `attr` tras modificar el conjunto."""
+        self._rendered.pop(attr, None)
 
-@dataclass
+@dataclass(slots=True)
 class StagedFile:
     """Representa un archivo en el área de staging."""
     path: str  # Ruta del archivo
     content: str  # Contenido
     status: str  # 'A' para añadido, 'M' para modificado, 'D' para eliminado
-    checksum: str  # Hash SHA-1 del contenido
+    checksum: str  # Hash del contenido (20 bytes en hex)
     last_commit_id: Optional[str]  # Referencia al último commit donde se modificó
 
-@dataclass
+@dataclass(slots=True)
 class Commit:
     """Representa un commit en el historial."""
-    id: str  # Hash SHA-1
+    id: str  # Hash de 20 bytes en hex
     message: str  # Mensaje del commit
     timestamp: datetime  # Fecha y hora
     author_email: str  # Email del autor
     parent_id: Optional[str]  # ID del commit padre
-    changes: Dict[str, str]  # Diccionario de cambios: nombre_archivo -> contenido
+    changes: Dict[str, str]  # Diccionario de cambios: nombre_archivo -> hash del blob
     branch: str  # Rama a la que pertenece
+    generation: int = 1  # Número de generación: 1 para la raíz, padre + 1 en adelante
+    modified_paths: FrozenSet[str] = frozenset()  # Archivos tocados (claves de changes)
 
-@dataclass
+@dataclass(slots=True)
 class FileStatus:
     """Representa el estado de un archivo."""
     path: str  # Ruta del archivo
@@ -2,33 +2,83 @@
 Implementación principal del repositorio para el sistema de simulación Git.
 """
 import os
+import sys
+import mmap
 import hashlib
-from datetime import datetime
-from typing import Dict, List, Optional, Set
+from collections import ChainMap
+from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, Iterable, List, MutableMapping, Optional, Tuple
 from .data_structures import (
-    Commit, FileStatus, Stack, StagedFile,
-    Queue, PullRequest
+    Commit, FileStatus, StagedFile,
+    Queue, PullRequest, PRStatus
 )
 
+# Códigos de estado compartidos por todos los StagedFile y FileStatus
+_STATUS_ADDED = sys.intern('A')
+_STATUS_MODIFIED = sys.intern('M')
+_STATUS_NEW = sys.intern('new')
+
+# Tamaño del digest: 20 bytes, 40 caracteres hex como los IDs de Git
+_DIGEST_SIZE = 20
+
+# Hasher ya configurado: copiarlo es más barato que construir uno nuevo con parámetros.
+# Se usa BLAKE3 (vectorizado con SIMD) si está instalado y BLAKE2b de hashlib si no.
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _HASHER_TEMPLATE = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    
+    def _hexdigest(hasher) -> str:
+        return hasher.hexdigest()
+else:
+    _HASHER_TEMPLATE = _blake3()
+    
+    def _hexdigest(hasher) -> str:
+        return hasher.hexdigest(length=_DIGEST_SIZE)
+
+# Tamaño de bloque para leer archivos en add_stream
+_READ_BLOCK_SIZE = 1 << 16
+# A partir de este tamaño add_stream mapea el archivo en memoria en lugar de copiarlo
+_MMAP_THRESHOLD = 1 << 22
+
 class Repository:
     def __init__(self, name: str, path: str):
         # Propiedades básicas del repositorio
         self.name = name
         self.path = path
-        self.staging_stack = Stack()  # Stack of StagedFile objects
+        # Área de staging: path -> StagedFile; el orden de inserción hace de pila
+        # (el último añadido es el tope)
+        self.staging_stack: Dict[str, StagedFile] = {}
+        self._status_cache: Optional[List[FileStatus]] = None  # Último resultado de status()
         self.commits: Dict[str, Commit] = {}
+        self._parent_of: Dict[str, Optional[str]] = {}  # commit_id -> parent_id, para recorridos
+        # Último historial devuelto por get_commit_history: (commit de cabeza, historial)
+        self._history_cache: Tuple[Optional[str], List[Commit]] = (None, [])
         self.current_branch = "main"
         self.branches: Dict[str, str] = {"main": None}  # branch_name -> commit_id
         self.head: Optional[str] = None  # current commit id
-        self.working_directory: Dict[str, str] = {}  # filename -> content
+        self._head_changes: Dict[str, str] = {}  # changes del commit HEAD ({} sin commits)
+        # filename -> hash del blob; tras un checkout es un ChainMap cuya capa base es
+        # el diccionario changes del commit (sólo lectura) y los add van a la capa superior
+        self.working_directory: MutableMapping[str, str] = {}
+        self.blobs: Dict[str, str] = {}  # hash -> contenido (almacén direccionado por contenido)
         self.detached_head = False
         self.pull_requests = Queue()  # Queue of PullRequest objects
         self.pr_counter = 0  # Counter for generating PR IDs
         self.pr_map: Dict[str, PullRequest] = {}  # ID -> PullRequest mapping
     
     def calculate_file_hash(self, content: str) -> str:
-        """Calcula el hash SHA-1 del contenido de un archivo."""
-        return hashlib.sha1(content.encode()).hexdigest()
+        """Calcula el hash (BLAKE3 o BLAKE2b) del contenido de un archivo."""
+        hasher = _HASHER_TEMPLATE.copy()
+        hasher.update(content.encode())
+        return _hexdigest(hasher)
+    
+    def get_blob(self, blob_hash: str) -> str:
+        """Devuelve el contenido almacenado bajo un hash de blob."""
+        try:
+            return self.blobs[blob_hash]
+        except KeyError:
+            raise ValueError(f"Blob '{blob_hash}' no encontrado") from None
     
     def list_branches(self) -> List[str]:
         """List all branches in the repository."""
@@ -36,25 +86,63 @@ class Repository:
     
     def create_pull_request(self, title: str, description: str, source_branch: str, target_branch: str, author: str) -> str:
         """Crea un nuevo pull request."""
+        unique_commits = self._unique_commits(source_branch, target_branch)
+        return self._add_pull_request(title, description, source_branch, target_branch, author,
+                                      unique_commits, datetime.now())
+    
+    def create_pull_requests_bulk(self, specs: Iterable[Tuple[str, str, str, str, str]]) -> List[str]:
+        """Crea varios pull requests a partir de (título, descripción, origen, destino, autor).
+        
+        Cada par origen/destino se recorre una sola vez aunque se repita, y todos
+        los PR comparten la misma fecha de creación. Si alguno no es válido no se
+        crea ninguno.
+        """
+        specs = list(specs)
+        walks: Dict[Tuple[str, str], List[str]] = {}
+        commit_lists = []
+        for _, _, source_branch, target_branch, _ in specs:
+            key = (source_branch, target_branch)
+            if key not in walks:
+                walks[key] = self._unique_commits(source_branch, target_branch)
+            commit_lists.append(walks[key])
+        
+        created_at = datetime.now()
+        return [
+            self._add_pull_request(title, description, source_branch, target_branch, author,
+                                   list(unique_commits), created_at)
+            for (title, description, source_branch, target_branch, author), unique_commits
+            in zip(specs, commit_lists)
+        ]
+    
+    def _unique_commits(self, source_branch: str, target_branch: str) -> List[str]:
+        """Commits de la rama origen que no están en la destino (al menos uno)."""
         # Validación de ramas
         if source_branch not in self.branches:
             raise ValueError(f"Rama origen '{source_branch}' no existe")
         if target_branch not in self.branches:
             raise ValueError(f"Rama destino '{target_branch}' no existe")
         
-        # Get commits that are in source branch but not in target branch
-        source_commits = self._get_branch_commits(source_branch)
-        target_commits = self._get_branch_commits(target_branch)
-        unique_commits = [c for c in source_commits if c not in target_commits]
+        # Se recorren ambas cadenas avanzando siempre la de mayor generación hasta
+        # que coinciden en el ancestro común, así que sólo se visitan los commits
+        # no compartidos
+        unique_commits = []
+        parent_of = self._parent_of
+        source = self.branches[source_branch]
+        target = self.branches[target_branch]
+        while source != target:
+            if self._generation(source) >= self._generation(target):
+                unique_commits.append(source)
+                source = parent_of[source]
+            else:
+                target = parent_of[target]
         
         if not unique_commits:
             raise ValueError("No hay cambios para fusionar")
-        
-        # Get modified files from these commits
-        modified_files = set()
-        for commit_id in unique_commits:
-            modified_files.update(self.commits[commit_id].changes.keys())
-        
+        return unique_commits
+    
+    def _add_pull_request(self, title: str, description: str, source_branch: str, target_branch: str,
+                          author: str, commit_ids: List[str], created_at: datetime) -> str:
+        """Registra un pull request ya validado y devuelve su ID."""
         # Generate PR ID
         self.pr_counter += 1
         pr_id = f"PR-{self.pr_counter}"
@@ -65,12 +153,12 @@ class Repository:
             title=title,
             description=description,
             author=author,
-            created_at=datetime.now(),
+            created_at=created_at,
             source_branch=source_branch,
             target_branch=target_branch,
-            commit_ids=unique_commits,
-            modified_files=modified_files,
-            reviewers=set()
+            commit_ids=commit_ids,
+            reviewers=set(),
+            commits=self.commits  # modified_files se calcula al leerlo por primera vez
         )
         
         # Add to queue and mapping
@@ -79,14 +167,9 @@ class Repository:
         
         return pr_id
     
-    def _get_branch_commits(self, branch_name: str) -> List[str]:
-        """Obtiene todos los IDs de commit en una rama."""
-        commits = []
-        current = self.branches[branch_name]
-        while current:
-            commits.append(current)
-            current = self.commits[current].parent_id
-        return commits
+    def _generation(self, commit_id: Optional[str]) -> int:
+        """Generación de un commit (0 para una rama sin commits)."""
+        return self.commits[commit_id].generation if commit_id else 0
     
     def get_pull_request(self, pr_id: str) -> Optional[PullRequest]:
         """Obtiene un pull request por ID."""
@@ -94,59 +177,52 @@ class Repository:
     
     def review_pull_request(self, pr_id: str, reviewer: str) -> None:
         """Añade un revisor a un pull request."""
-        pr = self.get_pull_request(pr_id)
-        if not pr:
-            raise ValueError(f"Pull request '{pr_id}' no encontrado")
-        if pr.status != "open":
-            raise ValueError(f"Pull request '{pr_id}' no está abierto")
+        pr = self._open_pull_request(pr_id)
         pr.reviewers.add(reviewer)
+        pr.invalidate('reviewers')
     
-    def approve_pull_request(self, pr_id: str) -> None:
-        """Aprueba un pull request."""
-        pr = self.get_pull_request(pr_id)
+    def _open_pull_request(self, pr_id: str) -> PullRequest:
+        """Devuelve un pull request que debe existir y estar abierto."""
+        pr = self.pr_map.get(pr_id)
         if not pr:
             raise ValueError(f"Pull request '{pr_id}' no encontrado")
-        if pr.status != "open":
+        if pr.status is not PRStatus.OPEN:
             raise ValueError(f"Pull request '{pr_id}' no está abierto")
-        pr.status = "approved"
+        return pr
+    
+    def _transition(self, pr_id: str, new_status: PRStatus) -> None:
+        """Cierra un pull request abierto con el estado indicado."""
+        pr = self._open_pull_request(pr_id)
+        pr.status = new_status
         pr.closed_at = datetime.now()
     
+    def bulk_transition(self, pr_ids: Iterable[str], new_status: PRStatus) -> None:
+        """Cierra varios pull requests abiertos con el mismo estado y la misma hora.
+        
+        Todos se validan antes de modificar ninguno, así que un ID inválido deja
+        los demás sin cambios.
+        """
+        prs = [self._open_pull_request(pr_id) for pr_id in pr_ids]
+        now = datetime.now()
+        for pr in prs:
+            pr.status = new_status
+            pr.closed_at = now
+    
+    def approve_pull_request(self, pr_id: str) -> None:
+        """Aprueba un pull request."""
+        self._transition(pr_id, PRStatus.APPROVED)
+    
     def reject_pull_request(self, pr_id: str) -> None:
         """Rechaza un pull request."""
-        pr = self.get_pull_request(pr_id)
-        if not pr:
-            raise ValueError(f"Pull request '{pr_id}' no encontrado")
-        if pr.status != "open":
-            raise ValueError(f"Pull request '{pr_id}' no está abierto")
-        pr.status = "rejected"
-        pr.closed_at = datetime.now()
+        self._transition(pr_id, PRStatus.REJECTED)
     
     def cancel_pull_request(self, pr_id: str) -> None:
         """Cancela un pull request."""
-        pr = self.get_pull_request(pr_id)
-        if not pr:
-            raise ValueError(f"Pull request '{pr_id}' no encontrado")
-        if pr.status != "open":
-            raise ValueError(f"Pull request '{pr_id}' no está abierto")
-        pr.status = "cancelled"
-        pr.closed_at = datetime.now()
+        self._transition(pr_id, PRStatus.CANCELLED)
     
     def list_pull_requests(self) -> List[PullRequest]:
         """Lista todos los pull requests."""
-        result = []
-        temp_queue = Queue()
-        
-        # Vacía la cola principal temporalmente
-        while not self.pull_requests.is_empty():
-            pr = self.pull_requests.dequeue()
-            result.append(pr)
-            temp_queue.enqueue(pr)
-        
-        # Restaura la cola original
-        while not temp_queue.is_empty():
-            self.pull_requests.enqueue(temp_queue.dequeue())
-        
-        return result
+        return list(self.pull_requests)
     
     def get_next_pull_request(self) -> Optional[PullRequest]:
         """Obtiene el siguiente pull request en la cola."""
@@ -158,6 +234,7 @@ class Repository:
         if not pr:
             raise ValueError(f"Pull request '{pr_id}' no encontrado")
         pr.tags.add(tag)
+        pr.invalidate('tags')
     
     def clear_pull_requests(self) -> None:
         """Limpia todos los pull requests."""
@@ -165,21 +242,70 @@ class Repository:
         self.pr_map.clear()
     
     def add(self, filename: str, content: str) -> None:
-        """Añade un archivo al área de staging usando una pila."""
-        self.working_directory[filename] = content
-        file_hash = self.calculate_file_hash(content)
+        """Añade un archivo al área de staging (diccionario ordenado por inserción)."""
+        self._stage(filename, content, self.calculate_file_hash(content))
+    
+    def bulk_add(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Añade varios archivos (nombre, contenido) al área de staging de una vez."""
+        new_hasher = _HASHER_TEMPLATE.copy
+        stage = self._stage
+        for filename, content in items:
+            hasher = new_hasher()
+            hasher.update(content.encode())
+            stage(filename, content, _hexdigest(hasher))
+    
+    def add_stream(self, filename: str, stream: BinaryIO) -> None:
+        """Añade un archivo leyéndolo por bloques, calculando el hash al vuelo.
+        
+        El contenido se decodifica como UTF-8 y los saltos de línea '\r\n' y '\r'
+        se normalizan a '\n', igual que al leer el archivo en modo texto.
+        """
+        try:
+            size = os.fstat(stream.fileno()).st_size
+        except (AttributeError, OSError):
+            size = 0  # Flujo sin descriptor de archivo (p. ej. BytesIO)
+        
+        # Archivos grandes: se hashea y decodifica directamente desde el mapeo,
+        # sin acumular una segunda copia de los bytes
+        hasher = _HASHER_TEMPLATE.copy()
+        if size >= _MMAP_THRESHOLD:
+            with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+                self._stage_text(filename, str(mapped, 'utf-8'), hasher, mapped.find(b'\r') != -1)
+            return
+        
+        data = bytearray()
+        for chunk in iter(lambda: stream.read(_READ_BLOCK_SIZE), b''):
+            hasher.update(chunk)
+            data += chunk
+        self._stage_text(filename, data.decode('utf-8'), hasher, b'\r' in data)
+    
+    def _stage_text(self, filename: str, content: str, hasher, has_cr: bool) -> None:
+        """Registra contenido leído en binario, normalizando los saltos de línea."""
+        if has_cr:
+            # El hash calculado al vuelo corresponde a los bytes sin normalizar
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+            self._stage(filename, content, self.calculate_file_hash(content))
+        else:
+            self._stage(filename, content, _hexdigest(hasher))
+    
+    def _stage(self, filename: str, content: str, file_hash: str) -> None:
+        """Registra en el área de staging un archivo con su hash ya calculado."""
+        # Los nombres de archivo se repiten en staging, commits y directorio de trabajo
+        filename = sys.intern(filename)
+        # Un mismo contenido se guarda una sola vez; el resto son referencias al blob
+        content = self.blobs.setdefault(file_hash, content)
+        self.working_directory[filename] = file_hash
         
         # Determina el estado del archivo
-        status = 'A'  # Añadido por defecto
+        status = _STATUS_ADDED  # Añadido por defecto
         last_commit_id = None
         
-        if self.head:
-            current_commit = self.commits[self.head]
-            if filename in current_commit.changes:
-                old_content = current_commit.changes[filename]
-                if old_content != content:
-                    status = 'M'  # Modificado
-                last_commit_id = self.head
+        old_hash = self._head_changes.get(filename)
+        if old_hash is not None:
+            if old_hash != file_hash:
+                status = _STATUS_MODIFIED  # Modificado
+            last_commit_id = self.head
         
         staged_file = StagedFile(
             path=filename,
@@ -189,41 +315,34 @@ class Repository:
             last_commit_id=last_commit_id
         )
         
-        # Clear any previous version of this file from the stack
-        temp_stack = Stack()
-        while not self.staging_stack.is_empty():
-            item = self.staging_stack.pop()
-            if item.path != filename:
-                temp_stack.push(item)
-        
-        # Restore other files and add the new one
-        while not temp_stack.is_empty():
-            self.staging_stack.push(temp_stack.pop())
-        self.staging_stack.push(staged_file)
-    
-    def commit(self, message: str, author_email: str) -> str:
-        """Crea un nuevo commit con los contenidos del área de staging."""
-        if self.staging_stack.is_empty():
+        # Sustituye la versión anterior del archivo y lo vuelve a poner en el tope
+        self.staging_stack.pop(filename, None)
+        self.staging_stack[filename] = staged_file
+        self._status_cache = None
+    
+    def commit(self, message: str, author_email: str, timestamp: Optional[datetime] = None) -> str:
+        """Crea un nuevo commit con los contenidos del área de staging.
+        
+        Si no se indica timestamp se usa la hora actual.
+        """
+        if not self.staging_stack:
             raise ValueError("Nada para commitear")
         
         # Collect all staged files
-        changes: Dict[str, str] = {}
-        temp_stack = Stack()
-        while not self.staging_stack.is_empty():
-            staged_file = self.staging_stack.pop()
-            changes[staged_file.path] = staged_file.content
-            temp_stack.push(staged_file)
-        
-        # Restore the staging stack (though we'll clear it after commit)
-        while not temp_stack.is_empty():
-            self.staging_stack.push(temp_stack.pop())
+        changes: Dict[str, str] = {
+            path: staged.checksum for path, staged in reversed(self.staging_stack.items())
+        }
         
         # Create commit ID from content and metadata
-        timestamp = datetime.now()
-        content_str = f"{message}{timestamp}{self.head}{author_email}"
-        for filename, content in sorted(changes.items()):
-            content_str += f"{filename}{content}"
-        commit_id = hashlib.sha1(content_str.encode()).hexdigest()
+        if timestamp is None:
+            timestamp = datetime.now()
+        # Se alimenta el hash por partes en lugar de concatenarlo todo en una cadena
+        hasher = _HASHER_TEMPLATE.copy()
+        hasher.update(f"{message}{timestamp}{self.head}{author_email}".encode())
+        for filename, blob_hash in sorted(changes.items()):
+            hasher.update(filename.encode())
+            hasher.update(blob_hash.encode())
+        commit_id = sys.intern(_hexdigest(hasher))
         
         # Create new commit
         new_commit = Commit(
@@ -233,18 +352,40 @@ class Repository:
             author_email=author_email,
             parent_id=self.head,
             changes=changes,
-            branch=self.current_branch
+            branch=self.current_branch,
+            generation=self._generation(self.head) + 1,
+            modified_paths=frozenset(changes)
         )
         
         # Update repository state
         self.commits[commit_id] = new_commit
+        self._parent_of[commit_id] = self.head
         self.head = commit_id
+        self._head_changes = changes
         if not self.detached_head:
             self.branches[self.current_branch] = commit_id
-        self.staging_stack.clear()
+        # El área de staging ya quedó volcada en changes: se sustituye por una nueva
+        self.staging_stack = {}
+        self._status_cache = None
         
         return commit_id
     
+    def commit_batch(self, items: Iterable[Tuple[str, str, Iterable[Tuple[str, str]]]],
+                     base_time: Optional[datetime] = None) -> List[str]:
+        """Crea una serie de commits a partir de (mensaje, autor, [(archivo, contenido), ...]).
+        
+        La hora se obtiene una sola vez y cada commit avanza un microsegundo, de
+        modo que los IDs siguen siendo distintos y el orden cronológico se conserva.
+        """
+        if base_time is None:
+            base_time = datetime.now()
+        step = timedelta(microseconds=1)
+        commit_ids = []
+        for i, (message, author_email, files) in enumerate(items):
+            self.bulk_add(files)
+            commit_ids.append(self.commit(message, author_email, base_time + i * step))
+        return commit_ids
+    
     def branch(self, name: str) -> None:
         """Create a new branch pointing to the current commit."""
         if name in self.branches:
@@ -257,7 +398,7 @@ class Repository:
             raise ValueError(f"Branch '{branch_name}' does not exist")
         
         # Limpiar el área de staging antes de cambiar de rama
-        if not self.staging_stack.is_empty():
+        if self.staging_stack:
             raise ValueError("Cannot switch branches with uncommitted changes")
         
         self.current_branch = branch_name
@@ -265,60 +406,80 @@ class Repository:
         self.detached_head = False
         
         # Update working directory to match the branch's state
-        if self.head and self.head in self.commits:
-            self.working_directory = dict(self.commits[self.head].changes)
+        head_commit = self.commits.get(self.head)
+        if head_commit is not None:
+            self._head_changes = head_commit.changes
+            self.working_directory = ChainMap({}, head_commit.changes)
         else:
-            self.working_directory.clear()
+            self._head_changes = {}
+            self.working_directory = {}
         self.staging_stack.clear()
+        self._status_cache = None
     
     def checkout_commit(self, commit_id: str) -> None:
         """Cambia a un commit específico."""
-        if commit_id not in self.commits:
+        target = self.commits.get(commit_id)
+        if target is None:
             raise ValueError(f"Commit '{commit_id}' not found")
         
         # Limpiar el área de staging antes de cambiar a un commit específico
-        if not self.staging_stack.is_empty():
+        if self.staging_stack:
             raise ValueError("Cannot checkout commit with uncommitted changes")
         
         self.head = commit_id
         self.detached_head = True
-        self.working_directory = dict(self.commits[commit_id].changes)
+        self._head_changes = target.changes
+        self.working_directory = ChainMap({}, target.changes)
         self.staging_stack.clear()
+        self._status_cache = None
     
     def status(self) -> List[FileStatus]:
-        """Obtiene el estado de los archivos en el directorio de trabajo y área de staging."""
+        """Obtiene el estado de los archivos en el directorio de trabajo y área de staging.
+        
+        El resultado se memoriza hasta el siguiente add, commit o checkout; la lista
+        devuelta es compartida y no debe modificarse.
+        """
+        if self._status_cache is not None:
+            return self._status_cache
+        
         status_list = []
-        staged_files = set()
+        staged_files = self.staging_stack
         
-        # Process staged files
-        temp_stack = Stack()
-        while not self.staging_stack.is_empty():
-            staged_file = self.staging_stack.pop()
-            staged_files.add(staged_file.path)
+        # Process staged files (del más reciente al más antiguo)
+        for staged_file in reversed(staged_files.values()):
             status_list.append(FileStatus(
                 path=staged_file.path,
                 status=staged_file.status,
                 content=staged_file.content
             ))
-            temp_stack.push(staged_file)
-        
-        # Restore staging stack
-        while not temp_stack.is_empty():
-            self.staging_stack.push(temp_stack.pop())
         
         # Check working directory for unstaged changes
-        for filename, content in self.working_directory.items():
+        for filename, blob_hash in self.working_directory.items():
             if filename not in staged_files:
-                status_list.append(FileStatus(filename, "new", content))
+                status_list.append(FileStatus(filename, _STATUS_NEW, self.blobs[blob_hash]))
         
+        self._status_cache = status_list
         return status_list
     
     def get_commit_history(self) -> List[Commit]:
-        """Devuelve el historial de commits para la rama actual."""
+        """Devuelve el historial de commits para la rama actual.
+        
+        Los commits son inmutables, así que el historial de la última cabeza
+        consultada se reutiliza: basta recorrer los commits nuevos hasta llegar a
+        ella. La lista devuelta es compartida y no debe modificarse.
+        """
+        cached_head, cached_history = self._history_cache
+        if cached_head == self.head:
+            return cached_history
+        
         history = []
         current = self.head
         while current:
+            if current == cached_head:
+                history.extend(cached_history)
+                break
             commit = self.commits[current]
             history.append(commit)
             current = commit.parent_id
+        self._history_cache = (self.head, history)
         return history
\ No newline at end of file
@@ -10,20 +10,23 @@ class RepositoryManager:
         # Lista de repositorios y repositorio actual
         self.repositories = LinkedList()
         self.current_repository: Optional[Repository] = None
+        # Índice por nombre (primer repositorio con ese nombre) para búsquedas O(1)
+        self._repo_index: Dict[str, Repository] = {}
     
     def create_repository(self, name: str, path: str) -> Repository:
         """Crea un nuevo repositorio."""
         repo = Repository(name, path)
         self.repositories.append(repo)
+        self._repo_index.setdefault(name, repo)
         self.current_repository = repo
         return repo
     
     def switch_repository(self, name: str) -> None:
         """Cambia a un repositorio diferente."""
-        node = self.repositories.find(lambda r: r.name == name)
-        if not node:
+        repo = self._repo_index.get(name)
+        if not repo:
             raise ValueError(f"Repositorio '{name}' no encontrado")
-        self.current_repository = node.data
+        self.current_repository = repo
     
     def list_repositories(self) -> list[str]:
         """Lista todos los repositorios."""
@@ -31,10 +34,14 @@ class RepositoryManager:
     
     def delete_repository(self, name: str) -> None:
         """Elimina un repositorio."""
-        repo = next((r for r in self.repositories.to_list() if r.name == name), None)
+        repo = self._repo_index.pop(name, None)
         if not repo:
             raise ValueError(f"Repositorio '{name}' no encontrado")
         
         self.repositories.remove(repo)
+        # Si quedaba otro repositorio con el mismo nombre, pasa a ser el indexado
+        duplicate = next((r for r in self.repositories.to_list() if r.name == name), None)
+        if duplicate is not None:
+            self._repo_index[name] = duplicate
         if self.current_repository and self.current_repository.name == name:
             self.current_repository = None
\ No newline at end of file
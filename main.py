@@ -1,40 +1,62 @@
 """
 Punto de entrada principal para el sistema de la simulacion de git
 """
+import sys
+from typing import Iterator
 from git_sim.cli import GitSimCLI
 
+# Comandos propios del intérprete (no pasan por el CLI de git)
+_REPL_COMMANDS = {
+    "help": GitSimCLI.get_help,
+}
+
+def _read_lines() -> Iterator[str]:
+    """Líneas de entrada: con prompt en una terminal, directamente de stdin si no."""
+    if not sys.stdin.isatty():
+        # Entrada redirigida (scripts): se itera el archivo sin input() ni prompt
+        yield from sys.stdin
+        return
+    while True:
+        try:
+            yield input("git-sim> ")
+        except EOFError:
+            return
+
 def main():
     cli = GitSimCLI()
     print("Sistema Simulado de Git")
     print("Escribe 'help' para obtener la lista de comandos")
     print("Escribe 'exit' para salir")
-    
-    while True:
-        try:
-            command = input("git-sim> ").strip()
-            if command.lower() == "exit":
-                break
-            
-            if command.lower() == "help":
-                print(cli.get_help())
-                continue
-            
-            if command.startswith("git"):
-                print("No incluir la palabra 'git' en los comandos")
-                continue
-            
-            parts = command.split()
-            if not parts:
-                continue
-            
-            result = cli.execute(parts[0], *parts[1:])
-            print(result)
-            
-        except KeyboardInterrupt:
-            print("\nSaliendo...")
-            break
-        except Exception as e:
-            print(f"Error: {str(e)}")
+
+    try:
+        for line in _read_lines():
+            try:
+                command = line.strip()
+                if not command:
+                    continue
+
+                # Se pasa a minúsculas una sola vez por línea
+                low = command.lower()
+                if low == "exit":
+                    break
+
+                repl_command = _REPL_COMMANDS.get(low)
+                if repl_command is not None:
+                    print(repl_command(cli))
+                    continue
+
+                # Sólo la palabra 'git' aislada (no p. ej. 'github')
+                if low == "git" or low.startswith("git "):
+                    print("No incluir la palabra 'git' en los comandos")
+                    continue
+
+                # El CLI divide la línea respetando comillas y valida los argumentos
+                print(cli.dispatch(command))
+
+            except Exception as e:
+                print(f"Error: {str(e)}")
+    except KeyboardInterrupt:
+        print("\nSaliendo...")
 
 if __name__ == "__main__":
     main()